@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Общая часть программ ind1.py и ind2.py: расписание отправлений,
+# хранение записей, их вывод, загрузка и сохранение в XML,
+# а также цикл обработки команд.
+
+from __future__ import annotations
+
+from array import array
+import bisect
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import time as dt_time
+from functools import lru_cache
+from itertools import chain
+import logging
+from operator import itemgetter
+import pickle
+import re
+import sys
+from typing import (
+    Callable,
+    ClassVar,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    TextIO,
+    Tuple,
+)
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
+
+
+# Класс пользовательского исключения в случае, если неверно
+# введено время отправления.
+class IllegalDateError(Exception):
+    def __init__(self, time, message="Illegal date format"):
+        self.date_str = time
+        self.message = message
+        super(IllegalDateError, self).__init__(message)
+
+    def __str__(self):
+        return f"{self.date_str} -> {self.message}"
+
+
+# Класс пользовательского исключения в случае, если введенная
+# команда является недопустимой.
+class UnknownCommandError(Exception):
+    def __init__(self, command, message="Unknown command"):
+        self.command = command
+        self.message = message
+        super(UnknownCommandError, self).__init__(message)
+
+    def __str__(self):
+        return f"{self.command} -> {self.message}"
+
+
+# Ключ сортировки строк (name, no, minutes) по пункту назначения.
+_NAME_KEY = itemgetter(0)
+
+# Допустимый формат времени отправления HH:MM.
+_TIME_RE = re.compile(r"\A(?:[01]\d|2[0-3]):[0-5]\d\Z")
+
+# Формат времени в загружаемых файлах: прежние версии программы
+# сохраняли часы и минуты без ведущего нуля, например "7:5".
+_FILE_TIME_RE = re.compile(r"\A([01]?\d|2[0-3]):([0-5]?\d)\Z")
+
+
+def _parse_minutes(time_str: str) -> int:
+    # Перевести строку "H:M" или "HH:MM" в число минут от начала суток.
+    match = _FILE_TIME_RE.match(time_str)
+    if match is None:
+        raise IllegalDateError(time_str, "Неверный формат времени, используйте HH:MM")
+    return int(match[1]) * 60 + int(match[2])
+
+
+def _format_minutes(minutes: int) -> str:
+    # Перевести число минут от начала суток в строку "HH:MM".
+    return "%02d:%02d" % divmod(minutes, 60)
+
+
+@lru_cache(maxsize=4096)
+def _escape_utf8(text: str) -> bytes:
+    # Экранировать текст для XML и закодировать в UTF-8. Пункты назначения
+    # и номера часто повторяются, поэтому результат кэшируется.
+    return escape(text).encode("utf8")
+
+
+class Record(NamedTuple):
+    name: str
+    no: str
+    time_str: str
+
+    @property
+    def time(self) -> dt_time:
+        # Строка времени всегда имеет вид "HH:MM".
+        return dt_time(int(self.time_str[:2]), int(self.time_str[3:]))
+
+
+@dataclass
+class Schedule:
+    # Тип записей, теги XML-документа и заголовок столбца номера
+    # задаются в наследниках.
+    record_type: ClassVar[type] = Record
+    root_tag: ClassVar[str] = "records"
+    item_tag: ClassVar[str] = "record"
+    no_heading: ClassVar[str] = "Номер"
+
+    # Данные хранятся в параллельных списках,
+    # упорядоченных по пункту назначения.
+    names: List[str] = field(default_factory=list)
+    nos: List[str] = field(default_factory=list)
+    # Время отправления в минутах от начала суток.
+    minutes: array = field(default_factory=lambda: array("H"))
+    # Индекс позиций записей по номеру, строится при первом обращении.
+    _by_no: Optional[Dict[str, List[int]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def records(self) -> List[Record]:
+        return [self._make(idx) for idx in range(len(self.names))]
+
+    def _make(self, idx: int) -> Record:
+        return self.record_type(
+            name=self.names[idx],
+            no=self.nos[idx],
+            time_str=_format_minutes(self.minutes[idx]),
+        )
+
+    def _index(self) -> Dict[str, List[int]]:
+        # Построить индекс по номерам, если данные изменились.
+        if self._by_no is None:
+            self._by_no = defaultdict(list)
+            for idx, no in enumerate(self.nos):
+                self._by_no[no].append(idx)
+        return self._by_no
+
+    def add(self, name: str, no: str, time: str) -> None:
+        if _TIME_RE.match(time) is None:
+            raise IllegalDateError(time, "Неверный формат времени, используйте HH:MM")
+        minutes = _parse_minutes(time)
+
+        # Вставить запись с сохранением упорядоченности по пункту назначения.
+        idx = bisect.bisect_right(self.names, name)
+        self.names.insert(idx, name)
+        self.nos.insert(idx, no)
+        self.minutes.insert(idx, minutes)
+        self._by_no = None
+
+    def _lines(self) -> Iterator[str]:
+        # Заголовок таблицы.
+        line = "+-{}-+-{}-+-{}-+-{}-+".format("-" * 4, "-" * 25, "-" * 15, "-" * 20)
+        header = "| {:^4} | {:^25} | {:^15} | {:^20} |".format(
+            "№", "Пункт назначения", self.no_heading, "Время отправления"
+        )
+
+        # Данные о всех записях.
+        row = "| %4d | %-25s | %-15s | %20s |"
+        rows = (
+            row % (idx, name, no, _format_minutes(minutes))
+            for idx, (name, no, minutes) in enumerate(
+                zip(self.names, self.nos, self.minutes), 1
+            )
+        )
+
+        return chain((line, header, line), rows, (line,))
+
+    def __str__(self) -> str:
+        return "\n".join(self._lines())
+
+    def print_to(self, file: TextIO) -> None:
+        # Выводить таблицу построчно, не собирая её в одну строку.
+        file.writelines(line + "\n" for line in self._lines())
+
+    def sort_by_time(self) -> List[Record]:
+        # Упорядочить записи по числу минут, не разбирая строки времени.
+        order = sorted(range(len(self.minutes)), key=self.minutes.__getitem__)
+        return [self._make(idx) for idx in order]
+
+    def select(self, nomer: str) -> Iterator[Record]:
+        # Записи создаются по мере перебора результата.
+        index = self._index()
+        return self._iter_positions(index, index.get(sys.intern(nomer), ()))
+
+    def _iter_positions(
+        self, index: Dict[str, List[int]], positions: List[int]
+    ) -> Iterator[Record]:
+        for idx in positions:
+            # После add или load позиции в индексе устарели, поэтому,
+            # как и словарь, прервать перебор с ошибкой.
+            if self._by_no is not index:
+                raise RuntimeError("schedule changed during iteration")
+            yield self._make(idx)
+
+    def load(self, filename: str) -> None:
+        # Формат файла определяется по расширению.
+        if filename.endswith(".pkl"):
+            self._load_pickle(filename)
+        else:
+            self._load_xml(filename)
+        self._by_no = None
+
+    def save(self, filename: str) -> None:
+        if filename.endswith(".pkl"):
+            self._save_pickle(filename)
+        else:
+            self._save_xml(filename)
+
+    def _load_pickle(self, filename: str) -> None:
+        # Столбцы читаются целиком, без разбора текста. Загружать
+        # следует только файлы из доверенного источника.
+        with open(filename, "rb") as fin:
+            data = pickle.load(fin)
+
+        # Проверить, что файл содержит три столбца одинаковой длины
+        # с допустимым временем отправления.
+        try:
+            names, nos, minutes = data
+            names, nos, minutes = list(names), list(nos), array("H", minutes)
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError(f"{filename}: файл не содержит данных расписания")
+        if not len(names) == len(nos) == len(minutes):
+            raise ValueError(f"{filename}: столбцы данных имеют разную длину")
+        if any(value >= 24 * 60 for value in minutes):
+            raise ValueError(f"{filename}: недопустимое время отправления")
+        if not all(isinstance(item, str) for item in chain(names, nos)):
+            raise ValueError(f"{filename}: пункты назначения и номера не строки")
+
+        # Восстановить упорядоченность по пункту назначения, на которую
+        # опираются add и вывод таблицы. Для уже упорядоченных данных
+        # сортировка выполняется за один проход.
+        rows = sorted(zip(names, nos, minutes), key=_NAME_KEY)
+        self.names = [row[0] for row in rows]
+        self.nos = [row[1] for row in rows]
+        self.minutes = array("H", [row[2] for row in rows])
+
+    def _save_pickle(self, filename: str) -> None:
+        with open(filename, "wb") as fout:
+            pickle.dump((self.names, self.nos, self.minutes), fout, protocol=5)
+
+    def _load_xml(self, filename: str) -> None:
+        # Разбирать файл потоково, не строя дерево документа целиком.
+        parser = ET.XMLParser(encoding="utf-8")
+        context = ET.iterparse(filename, events=("start", "end"), parser=parser)
+        _, root = next(context)
+
+        rows: List[Tuple[str, str, int]] = []
+        for event, item_element in context:
+            if event != "end" or item_element.tag != self.item_tag:
+                continue
+
+            name = item_element.findtext("name")
+            no = item_element.findtext("no")
+            time_str = item_element.findtext("time")
+
+            # Записи с отсутствующими или пустыми полями пропускаются.
+            if name and no and time_str:
+                # Повторяющиеся пункты назначения и номера хранятся
+                # в единственном экземпляре.
+                rows.append(
+                    (sys.intern(name), sys.intern(no), _parse_minutes(time_str))
+                )
+
+            # Освободить уже обработанные элементы.
+            root.clear()
+
+        # Отсортировать загруженные записи один раз.
+        rows.sort(key=_NAME_KEY)
+        self.names = [row[0] for row in rows]
+        self.nos = [row[1] for row in rows]
+        self.minutes = array("H", [row[2] for row in rows])
+
+    def _save_xml(self, filename: str) -> None:
+        root_tag = self.root_tag.encode("utf8")
+        item_tag = self.item_tag.encode("utf8")
+        # Шаблон одной записи с уже подставленным тегом.
+        template = (
+            b"<" + item_tag + b"><name>%s</name><no>%s</no>"
+            b"<time>%02d:%02d</time></" + item_tag + b">"
+        )
+
+        # Сформировать XML-документ напрямую, без построения дерева элементов.
+        chunks = [b"<?xml version='1.0' encoding='utf8'?>\n<%s>" % root_tag]
+        for name, no, minutes in zip(self.names, self.nos, self.minutes):
+            chunks.append(
+                template % (_escape_utf8(name), _escape_utf8(no), *divmod(minutes, 60))
+            )
+        chunks.append(b"</%s>" % root_tag)
+
+        # Не удерживать строки сохраненных записей в кэше.
+        _escape_utf8.cache_clear()
+
+        with open(filename, "wb") as fout:
+            fout.write(b"".join(chunks))
+
+
+def do_load(po: Schedule, arg: str) -> None:
+    # Загрузить данные из файла.
+    po.load(arg)
+    logging.info("Загружены данные из файла %s.", arg)
+
+
+def do_save(po: Schedule, arg: str) -> None:
+    # Сохранить данные в файл.
+    po.save(arg)
+    logging.info("Сохранены данные в файл %s.", arg)
+
+
+# Команды, которым обязательно передается аргумент. Остальные
+# команды вызываются без аргумента.
+ARG_COMMANDS = {"select", "load", "save"}
+
+
+def run(po: Schedule, handlers: Dict[str, Callable[[Schedule, str], None]]) -> None:
+    # Таблица обработчиков команд: общие команды работы с файлами
+    # дополняются командами конкретной программы.
+    dispatch = {"load": do_load, "save": do_save, **handlers}
+
+    # Организовать бесконечный цикл запроса команд.
+    while True:
+        try:
+            # Запросить команду из терминала.
+            command = input(">>> ")
+
+            # Выделить из команды её имя и аргумент. Регистр приводится
+            # только у имени команды, чтобы не искажать имена файлов.
+            verb, _, arg = command.partition(" ")
+            verb = verb.lower()
+            arg = arg.strip()
+            if verb == "exit" and not arg:
+                break
+
+            # Выполнить действие в соответствие с командой.
+            handler = dispatch.get(verb)
+            if handler is None or (verb in ARG_COMMANDS) != bool(arg):
+                raise UnknownCommandError(command)
+            handler(po, arg)
+
+        except Exception as exc:
+            logging.error("Ошибка: %s", exc)
+            print(exc, file=sys.stderr)